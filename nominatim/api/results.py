@@ -172,7 +172,7 @@ class BaseResult:
         """ Fill the locale_name and the display_name field for the
             place and, if available, its address information.
         """
-        self.locale_name = locales.display_name(self.names)
+        self.locale_name = locales.display_name(self.names) if self.names else ''
         if self.address_rows:
             self.display_name = ', '.join(self.address_rows.localize(locales))
         else:
@@ -11,6 +11,7 @@ These tables have been copied verbatim from the old PHP code. For future
 version a more flexible formatting is required.
 """
 from typing import Tuple, Optional, Mapping, Union
+import functools
 
 import nominatim.api as napi
 
@@ -18,25 +19,37 @@ def get_label_tag(category: Tuple[str, str], extratags: Optional[Mapping[str, st
                   rank: int, country: Optional[str]) -> str:
     """ Create a label tag for the given place that can be used as an XML name.
     """
-    if rank < 26 and extratags and 'place' in extratags:
-        label = extratags['place']
-    elif rank < 26 and extratags and 'linked_place' in extratags:
-        label = extratags['linked_place']
+    if rank < 26 and extratags:
+        label = extratags.get('place')
+        if label is None:
+            label = extratags.get('linked_place')
+        if label is not None:
+            return label.lower().replace(' ', '_')
+
+    return _get_category_label_tag(category, rank, country or '')
+
+
+@functools.lru_cache(maxsize=512)
+def _get_category_label_tag(category: Tuple[str, str], rank: int, country: str) -> str:
+    """ Compute the label tag for a place from its category, rank and country
+        alone. There are few distinct combinations of these, so the
+        results are cached.
+    """
+    cls, typ = category
+    if rank < 26 and typ != 'postal_code' and category != ('boundary', 'administrative'):
+        # Most common case: a non-administrative place of the address.
+        label = typ if typ != 'yes' else cls
     elif category == ('boundary', 'administrative'):
-        label = ADMIN_LABELS.get((country or '', int(rank/2)))\
-                or ADMIN_LABELS.get(('', int(rank/2)))\
-                or 'Administrative'
-    elif category[1] == 'postal_code':
-        label = 'postcode'
-    elif rank < 26:
-        label = category[1] if category[1] != 'yes' else category[0]
+        return ADMIN_LABEL_TAGS.get((country, rank))\
+               or ADMIN_LABEL_TAGS.get(('', rank), 'administrative')
+    elif typ == 'postal_code':
+        return 'postcode'
     elif rank < 28:
-        label = 'road'
-    elif category[0] == 'place'\
-         and category[1] in ('house_number', 'house_name', 'country_code'):
-        label = category[1]
+        return 'road'
+    elif cls == 'place' and typ in ('house_number', 'house_name', 'country_code'):
+        label = typ
     else:
-        label = category[0]
+        label = cls
 
     return label.lower().replace(' ', '_')
 
@@ -84,6 +97,15 @@ ADMIN_LABELS = {
   ('se', 4): 'County'
 }
 
+# Precomputed label tags for administrative boundaries for each
+# (country, rank address) combination with fallbacks already resolved.
+ADMIN_LABEL_TAGS = {
+  (country, rank): (ADMIN_LABELS.get((country, rank // 2))
+                    or ADMIN_LABELS.get(('', rank // 2))
+                    or 'Administrative').lower().replace(' ', '_')
+  for country in set(c for c, _ in ADMIN_LABELS) for rank in range(31)
+}
+
 
 ICONS = {
     ('boundary', 'administrative'): 'poi_boundary_administrative',
@@ -7,7 +7,8 @@
 """
 Helper functions for output of results in json formats.
 """
-from typing import Mapping, Any, Optional, Tuple, Union
+from typing import Mapping, Any, Optional, Tuple, Union, Dict
+import functools
 
 import nominatim.api as napi
 import nominatim.api.v1.classtypes as cl
@@ -21,6 +22,14 @@ def _write_osm_id(out: JsonWriter, osm_object: Optional[Tuple[str, int]]) -> Non
            .keyval('osm_id', osm_object[1])
 
 
+@functools.lru_cache(maxsize=8)
+def _get_icon_urls(icon_base_url: str) -> Dict[Tuple[str, str], str]:
+    """ Return a mapping of categories to full icon URLs. The base URL
+        is a configuration setting, so the result is cached.
+    """
+    return {cat: f"{icon_base_url}/{icon}.p.20.png" for cat, icon in cl.ICONS.items()}
+
+
 def _write_typed_address(out: JsonWriter, address: Optional[napi.AddressLines],
                                country_code: Optional[str]) -> None:
     parts = {}
@@ -48,9 +57,10 @@ def _write_geocodejson_address(out: JsonWriter,
     extra = {}
     for line in (address or []):
         if line.isaddress and line.local_name:
-            if line.category[1] in ('postcode', 'postal_code'):
+            typ = line.category[1]
+            if typ in POSTCODE_TYPES:
                 out.keyval('postcode', line.local_name)
-            elif line.category[1] == 'house_number':
+            elif typ == 'house_number':
                 out.keyval('housenumber', line.local_name)
             elif (obj_place_id is None or obj_place_id != line.place_id) \
                  and line.rank_address >= 4 and line.rank_address < 28:
@@ -58,7 +68,6 @@ def _write_geocodejson_address(out: JsonWriter,
                 if rank_name not in extra:
                     extra[rank_name] = line.local_name
 
-
     for k, v in extra.items():
         out.keyval(k, v)
 
@@ -71,14 +80,25 @@ def format_base_json(results: Union[napi.ReverseResults, napi.SearchResults],
                      class_label: str) -> str:
     """ Return the result list as a simple json string in custom Nominatim format.
     """
+    if not results and simple:
+        return '{"error":"Unable to geocode"}'
+
     out = JsonWriter()
 
-    if simple:
-        if not results:
-            return '{"error":"Unable to geocode"}'
-    else:
+    if not simple:
         out.start_array()
 
+    # fixed sequence of fields that every result has
+    base_template = '"lat":%s,"lon":%s,"' + class_label + '":%s,"type":%s,'\
+                    '"place_rank":%s,"importance":%s,"addresstype":%s,'\
+                    '"name":%s,"display_name":%s'
+
+    icon_base_url = options.get('icon_base_url', None)
+    icon_urls = _get_icon_urls(icon_base_url) if icon_base_url else None
+    with_address = options.get('addressdetails', False)
+    with_extratags = options.get('extratags', False)
+    with_namedetails = options.get('namedetails', False)
+
     for result in results:
         out.start_object()\
              .keyval_not_none('place_id', result.place_id)\
@@ -86,49 +106,43 @@ def format_base_json(results: Union[napi.ReverseResults, napi.SearchResults],
 
         _write_osm_id(out, result.osm_object)
 
-        out.keyval('lat', result.centroid.lat)\
-             .keyval('lon', result.centroid.lon)\
-             .keyval(class_label, result.category[0])\
-             .keyval('type', result.category[1])\
-             .keyval('place_rank', result.rank_search)\
-             .keyval('importance', result.calculated_importance())\
-             .keyval('addresstype', cl.get_label_tag(result.category, result.extratags,
-                                                     result.rank_address,
-                                                     result.country_code))\
-             .keyval('name', result.locale_name or '')\
-             .keyval('display_name', result.display_name or '')
-
-
-        if options.get('icon_base_url', None):
-            icon = cl.ICONS.get(result.category)
-            if icon:
-                out.keyval('icon', f"{options['icon_base_url']}/{icon}.p.20.png")
-
-        if options.get('addressdetails', False):
+        out.template(base_template,
+                     result.centroid.lat, result.centroid.lon,
+                     result.category[0], result.category[1],
+                     result.rank_search, result.calculated_importance(),
+                     cl.get_label_tag(result.category, result.extratags,
+                                      result.rank_address, result.country_code),
+                     result.locale_name or '', result.display_name or '').next()
+
+
+        if icon_urls is not None:
+            icon_url = icon_urls.get(result.category)
+            if icon_url:
+                out.keyval('icon', icon_url)
+
+        if with_address:
             out.key('address').start_object()
             _write_typed_address(out, result.address_rows, result.country_code)
             out.end_object().next()
 
-        if options.get('extratags', False):
+        if with_extratags:
             out.keyval('extratags', result.extratags)
 
-        if options.get('namedetails', False):
+        if with_namedetails:
             out.keyval('namedetails', result.names)
 
         bbox = cl.bbox_from_result(result)
-        out.key('boundingbox').start_array()\
-             .value(f"{bbox.minlat:0.7f}").next()\
-             .value(f"{bbox.maxlat:0.7f}").next()\
-             .value(f"{bbox.minlon:0.7f}").next()\
-             .value(f"{bbox.maxlon:0.7f}").next()\
-           .end_array().next()
-
-        if result.geometry:
-            for key in ('text', 'kml'):
-                out.keyval_not_none('geo' + key, result.geometry.get(key))
-            if 'geojson' in result.geometry:
-                out.key('geojson').raw(result.geometry['geojson']).next()
-            out.keyval_not_none('svg', result.geometry.get('svg'))
+        out.key('boundingbox')\
+           .raw(f'["{bbox.minlat:0.7f}","{bbox.maxlat:0.7f}",'
+                f'"{bbox.minlon:0.7f}","{bbox.maxlon:0.7f}"]').next()
+
+        geometry = result.geometry
+        if geometry:
+            out.keyval_not_none('geotext', geometry.get('text'))\
+               .keyval_not_none('geokml', geometry.get('kml'))
+            if 'geojson' in geometry:
+                out.key('geojson').raw(geometry['geojson']).next()
+            out.keyval_not_none('svg', geometry.get('svg'))
 
         out.end_object()
 
@@ -157,7 +171,12 @@ def format_base_geojson(results: Union[napi.ReverseResults, napi.SearchResults],
          .keyval('licence', cl.OSM_ATTRIBUTION)\
          .key('features').start_array()
 
+    with_address = options.get('addressdetails', False)
+    with_extratags = options.get('extratags', False)
+    with_namedetails = options.get('namedetails', False)
+
     for result in results:
+        category = result.category
         out.start_object()\
              .keyval('type', 'Feature')\
              .key('properties').start_object()
@@ -167,24 +186,24 @@ def format_base_geojson(results: Union[napi.ReverseResults, napi.SearchResults],
         _write_osm_id(out, result.osm_object)
 
         out.keyval('place_rank', result.rank_search)\
-           .keyval('category', result.category[0])\
-           .keyval('type', result.category[1])\
+           .keyval('category', category[0])\
+           .keyval('type', category[1])\
            .keyval('importance', result.calculated_importance())\
-           .keyval('addresstype', cl.get_label_tag(result.category, result.extratags,
+           .keyval('addresstype', cl.get_label_tag(category, result.extratags,
                                                    result.rank_address,
                                                    result.country_code))\
            .keyval('name', result.locale_name or '')\
            .keyval('display_name', result.display_name or '')
 
-        if options.get('addressdetails', False):
+        if with_address:
             out.key('address').start_object()
             _write_typed_address(out, result.address_rows, result.country_code)
             out.end_object().next()
 
-        if options.get('extratags', False):
+        if with_extratags:
             out.keyval('extratags', result.extratags)
 
-        if options.get('namedetails', False):
+        if with_namedetails:
             out.keyval('namedetails', result.names)
 
         out.end_object().next() # properties
@@ -223,7 +242,12 @@ def format_base_geocodejson(results: Union[napi.ReverseResults, napi.SearchResul
            .end_object().next()\
          .key('features').start_array()
 
+    with_address = options.get('addressdetails', False)
+
     for result in results:
+        category = result.category
+        address_rows = result.address_rows
+        rank = result.rank_address
         out.start_object()\
              .keyval('type', 'Feature')\
              .key('properties').start_object()\
@@ -233,20 +257,21 @@ def format_base_geocodejson(results: Union[napi.ReverseResults, napi.SearchResul
 
         _write_osm_id(out, result.osm_object)
 
-        out.keyval('osm_key', result.category[0])\
-           .keyval('osm_value', result.category[1])\
-           .keyval('type', GEOCODEJSON_RANKS[max(3, min(28, result.rank_address))])\
+        out.keyval('osm_key', category[0])\
+           .keyval('osm_value', category[1])\
+           .keyval('type', GEOCODEJSON_RANKS[rank if 0 <= rank <= 30
+                                             else (0 if rank < 0 else 30)])\
            .keyval_not_none('accuracy', getattr(result, 'distance', None), transform=int)\
            .keyval('label', result.display_name or '')\
            .keyval_not_none('name', result.locale_name or None)\
 
-        if options.get('addressdetails', False):
-            _write_geocodejson_address(out, result.address_rows, result.place_id,
+        if with_address:
+            _write_geocodejson_address(out, address_rows, result.place_id,
                                        result.country_code)
 
             out.key('admin').start_object()
-            if result.address_rows:
-                for line in result.address_rows:
+            if address_rows:
+                for line in address_rows:
                     if line.isaddress and (line.admin_level or 15) < 15 and line.local_name:
                         out.keyval(f"level{line.admin_level}", line.local_name)
             out.end_object().next()
@@ -263,12 +288,17 @@ def format_base_geocodejson(results: Union[napi.ReverseResults, napi.SearchResul
     return out()
 
 
-GEOCODEJSON_RANKS = {
-    3: 'locality',
-    4: 'country',
-    5: 'state', 6: 'state', 7: 'state', 8: 'state', 9: 'state',
-    10: 'county', 11: 'county', 12: 'county',
-    13: 'city', 14: 'city', 15: 'city', 16: 'city',
-    17: 'district', 18: 'district', 19: 'district', 20: 'district', 21: 'district',
-    22: 'locality', 23: 'locality', 24: 'locality',
-    25: 'street', 26: 'street', 27: 'street', 28: 'house'}
+POSTCODE_TYPES = frozenset(('postcode', 'postal_code'))
+
+# Geocodejson type indexed by address rank. Covers the full rank range
+# from 0 to 30, callers need to clamp ranks outside this range.
+# Ranks below 3 are mapped like rank 3, ranks above 28 like rank 28.
+GEOCODEJSON_RANKS = (
+    'locality', 'locality', 'locality', 'locality',
+    'country',
+    'state', 'state', 'state', 'state', 'state',
+    'county', 'county', 'county',
+    'city', 'city', 'city', 'city',
+    'district', 'district', 'district', 'district', 'district',
+    'locality', 'locality', 'locality',
+    'street', 'street', 'street', 'house', 'house', 'house')
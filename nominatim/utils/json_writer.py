@@ -126,6 +126,15 @@ class JsonWriter:
         return self
 
 
+    def template(self, template: str, *values: Any) -> 'JsonWriter':
+        """ Write out a pre-formatted JSON fragment. Each '%s' placeholder
+            in the template string is replaced with the JSON encoding of
+            the corresponding value. This is useful to write out
+            a fixed sequence of object elements in one go.
+        """
+        return self.raw(template % tuple(json.dumps(v, ensure_ascii=False) for v in values))
+
+
     def keyval(self, key: str, value: Any) -> 'JsonWriter':
         """ Write out an object element with the given key and value.
             This is a shortcut for calling 'key()', 'value()' and 'next()'.
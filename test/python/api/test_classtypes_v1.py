@@ -0,0 +1,49 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+# This file is part of Nominatim. (https://nominatim.org)
+#
+# Copyright (C) 2023 by the Nominatim developer community.
+# For a full list of authors see the git log.
+"""
+Tests for the hard-coded tag category information of the v1 API.
+"""
+import pytest
+
+import nominatim.api.v1.classtypes as cl
+
+@pytest.mark.parametrize('rank,country,label', [(4, None, 'country'),
+                                                (4, 'de', 'country'),
+                                                (8, 'de', 'state'),
+                                                (8, 'no', 'county'),
+                                                (11, 'se', 'state_district'),
+                                                (24, 'fe', 'city_block'),
+                                                (27, None, 'administrative')])
+def test_get_label_tag_admin(rank, country, label):
+    assert cl.get_label_tag(('boundary', 'administrative'), None,
+                            rank, country) == label
+
+
+@pytest.mark.parametrize('category,rank,label', [(('place', 'Local Area'), 20, 'local_area'),
+                                                 (('building', 'yes'), 20, 'building'),
+                                                 (('place', 'postal_code'), 21, 'postcode'),
+                                                 (('highway', 'residential'), 26, 'road'),
+                                                 (('place', 'house_number'), 30, 'house_number'),
+                                                 (('amenity', 'pub'), 30, 'amenity')])
+def test_get_label_tag_category(category, rank, label):
+    assert cl.get_label_tag(category, None, rank, 'de') == label
+
+
+def test_get_label_tag_place_extratag():
+    assert cl.get_label_tag(('boundary', 'administrative'),
+                            {'place': 'Big Town', 'linked_place': 'city'},
+                            16, None) == 'big_town'
+
+
+def test_get_label_tag_linked_place_extratag():
+    assert cl.get_label_tag(('boundary', 'administrative'),
+                            {'linked_place': 'city'}, 16, None) == 'city'
+
+
+def test_get_label_tag_extratag_ignored_for_high_ranks():
+    assert cl.get_label_tag(('highway', 'primary'),
+                            {'place': 'square'}, 26, None) == 'road'
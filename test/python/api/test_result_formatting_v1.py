@@ -325,3 +325,30 @@ def test_search_details_keywords_address():
                                       {'id': 24, 'token': 'foo'}],
                               'name': []}
 
+
+@pytest.mark.parametrize('fmt', ['json', 'jsonv2', 'geojson'])
+def test_search_address_iso_code_last_line_wins(fmt):
+    lines = [napi.AddressLine(place_id=None, osm_object=None,
+                              category=('boundary', 'administrative'),
+                              names={'name': name, 'ISO3166-2': iso},
+                              extratags=None, admin_level=8, fromarea=False,
+                              isaddress=True, rank_address=16, distance=0.0)
+             for name, iso in (('Town', 'DE-X'), ('Other Town', 'DE-Y'))]
+    search = napi.SearchResult(napi.SourceTable.PLACEX,
+                               ('place', 'thing'),
+                               napi.Point(1.0, 2.0),
+                               country_code='de',
+                               address_rows=napi.AddressLines(lines))
+    search.localize(napi.Locales())
+
+    result = api_impl.format_result(napi.SearchResults([search]), fmt,
+                                    {'addressdetails': True})
+    js = json.loads(result)
+
+    if fmt == 'geojson':
+        address = js['features'][0]['properties']['address']
+    else:
+        address = js[0]['address']
+
+    assert list(address.items()) == [('city', 'Town'), ('ISO3166-2-lvl8', 'DE-Y'),
+                                     ('country_code', 'de')]
@@ -176,6 +176,51 @@ def test_format_reverse_geocodejson_special_parts():
     assert 'county' not in props
 
 
+def test_format_reverse_geocodejson_address_order():
+    def _line(category, name, rank):
+        return napi.AddressLine(place_id=None, osm_object=None,
+                                category=category, names={'name': name},
+                                extratags=None, admin_level=15, fromarea=False,
+                                isaddress=True, rank_address=rank, distance=0.0)
+
+    reverse = napi.ReverseResult(napi.SourceTable.PLACEX,
+                                 ('place', 'house'),
+                                 napi.Point(1.0, 2.0),
+                                 country_code='fe',
+                                 address_rows=napi.AddressLines([
+                                   _line(('place', 'house_number'), '1', 30),
+                                   _line(('highway', 'residential'), 'Main St', 26),
+                                   _line(('place', 'postcode'), '99446', 5),
+                                   _line(('place', 'city'), 'Town', 16)
+                                 ]))
+
+    reverse.localize(napi.Locales())
+
+    raw = api_impl.format_result(napi.ReverseResults([reverse]), 'geocodejson',
+                                 {'addressdetails': True})
+
+    props = json.loads(raw)['features'][0]['properties']['geocoding']
+    keys = list(props)
+    assert keys[keys.index('housenumber'):keys.index('admin')] \
+             == ['housenumber', 'postcode', 'street', 'city', 'country_code']
+
+
+@pytest.mark.parametrize('rank,geotype', [(0, 'locality'), (4, 'country'),
+                                          (16, 'city'), (26, 'street'),
+                                          (28, 'house'), (30, 'house'),
+                                          (-1, 'locality'), (35, 'house')])
+def test_format_reverse_geocodejson_type(rank, geotype):
+    reverse = napi.ReverseResult(napi.SourceTable.PLACEX,
+                                 ('place', 'thing'),
+                                 napi.Point(1.0, 2.0),
+                                 rank_address=rank)
+
+    raw = api_impl.format_result(napi.ReverseResults([reverse]), 'geocodejson', {})
+
+    props = json.loads(raw)['features'][0]['properties']['geocoding']
+    assert props['type'] == geotype
+
+
 @pytest.mark.parametrize('fmt', FORMATS)
 def test_format_reverse_with_address_none(fmt):
     reverse = napi.ReverseResult(napi.SourceTable.PLACEX,
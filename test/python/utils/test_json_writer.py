@@ -104,3 +104,15 @@ def test_raw_output():
                 .end_array()
 
     assert writer() == '[{ "nicely": "formatted here" },1]'
+
+
+def test_template_output():
+    writer = JsonWriter()\
+                .start_object()\
+                    .keyval('a', 1)\
+                    .template('"b":%s,"c":%s,"d":%s', 'x\ty', 2.5, None).next()\
+                    .keyval('e', 'z')\
+                .end_object()
+
+    assert writer() == '{"a":1,"b":"x\\ty","c":2.5,"d":null,"e":"z"}'
+    json.loads(writer())